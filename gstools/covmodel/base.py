@@ -1123,6 +1123,15 @@ class CovModel(six.with_metaclass(InitSubclassMeta)):
         """:class:`bool`: State if a ppf is defined by the user."""
         return self._has_ppf()
 
+    @property
+    def has_finite_range(self):
+        """:class:`bool`: State if the model has a compact support.
+
+        For these models the correlation vanishes for distances
+        greater or equal the length scale.
+        """
+        return np.isclose(self.correlation(self.len_scale), 0)
+
     @property
     def sill(self):
         """:class:`float`: The sill of the variogram.
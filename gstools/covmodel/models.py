@@ -64,6 +64,19 @@ class Gaussian(CovModel):
         r = np.array(np.abs(r), dtype=np.double)
         return np.exp(-np.pi / 4 * (r / self.len_scale) ** 2)
 
+    def cor_from_d2(self, d2):
+        r"""Gaussian correlation function evaluated on squared distances.
+
+        Since the correlation only depends on :math:`r^2`, the square
+        root of the distance calculation can be skipped entirely.
+
+        .. math::
+           \mathrm{cor}(r) =
+           \exp\left(- \frac{\pi}{4}\cdot \frac{r^2}{\ell^2}\right)
+        """
+        d2 = np.array(np.abs(d2), dtype=np.double)
+        return np.exp(-np.pi / 4 * d2 / self.len_scale ** 2)
+
     def spectral_density(self, k):  # noqa: D102
         k = np.array(k, dtype=np.double)
         return (self.len_scale / np.pi) ** self.dim * np.exp(
@@ -12,9 +12,11 @@ The following classes are provided
 # pylint: disable=C0103
 from __future__ import division, absolute_import, print_function
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from scipy.linalg import inv
-from scipy.spatial.distance import cdist
+from scipy.linalg import lu_factor, lu_solve
 
 from gstools.field.tools import (
     check_mesh,
@@ -25,8 +27,13 @@ from gstools.field.tools import (
 )
 from gstools.field.base import Field
 from gstools.tools.geometric import pos2xyz, xyz2pos
-from gstools.krige.krigesum import krigesum
-from gstools.krige.tools import set_condition
+from gstools.krige.tools import (
+    set_condition,
+    get_dists,
+    krigesum_factored,
+    chunk_slices,
+    _stack_pos,
+)
 
 __all__ = ["Ordinary"]
 
@@ -43,18 +50,33 @@ class Ordinary(Field):
         tuple, containing the given condition positions (x, [y, z])
     cond_val : :class:`numpy.ndarray`
         the values of the conditions
+    dtype : data-type, optional
+        floating point data-type used for the kriging system.
+        :class:`numpy.float32` halves the memory traffic of the
+        chunked evaluation at the cost of precision.
+        Default: :class:`numpy.double`
     """
 
-    def __init__(self, model, cond_pos, cond_val):
+    def __init__(self, model, cond_pos, cond_val, dtype=np.double):
         super(Ordinary, self).__init__(model, mean=0.0)
         self.krige_var = None
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != "f":
+            raise ValueError(
+                "Ordinary: 'dtype' needs to be a floating point type."
+            )
         # initialize private attributes
         self._value_type = "scalar"
         self._cond_pos = None
         self._cond_val = None
+        self._krige_mat = None
+        self._krige_cond = None
+        self._cond_stack = None
         self.set_condition(cond_pos, cond_val)
 
-    def __call__(self, pos, mesh_type="unstructured"):
+    def __call__(
+        self, pos, mesh_type="unstructured", chunk_size=None, parallel=False
+    ):
         """
         Generate the ordinary kriging field.
 
@@ -67,6 +89,13 @@ class Ordinary(Field):
             directions (x, [y, z])
         mesh_type : :class:`str`
             'structured' / 'unstructured'
+        chunk_size : :class:`int` or :any:`None`, optional
+            Chunk the given points to limit the memory consumption.
+            If None, all points are processed at once. Default: None
+        parallel : :class:`bool`, optional
+            Process the chunks with a thread pool. Since each chunk
+            produces an independent slice of the field, this scales with
+            the number of cores. Default: False
 
         Returns
         -------
@@ -76,22 +105,32 @@ class Ordinary(Field):
             the kriging error variance
         """
         # internal conversation
-        x, y, z = pos2xyz(pos, dtype=np.double, max_dim=self.model.dim)
+        x, y, z = pos2xyz(pos, dtype=self.dtype, max_dim=self.model.dim)
         c_x, c_y, c_z = pos2xyz(
-            self.cond_pos, dtype=np.double, max_dim=self.model.dim
+            self.cond_pos, dtype=self.dtype, max_dim=self.model.dim
         )
         self.pos = xyz2pos(x, y, z)
         self.mesh_type = mesh_type
         # format the positional arguments of the mesh
         check_mesh(self.model.dim, x, y, z, mesh_type)
         mesh_type_changed = False
+        separable = False
         if mesh_type == "structured":
             mesh_type_changed = True
             mesh_type_old = mesh_type
             mesh_type = "unstructured"
-            x, y, z, axis_lens = reshape_axis_from_struct_to_unstruct(
-                self.model.dim, x, y, z
-            )
+            if self.model.do_rotation:
+                x, y, z, axis_lens = reshape_axis_from_struct_to_unstruct(
+                    self.model.dim, x, y, z
+                )
+            else:
+                # without rotation, distances separate along the axes,
+                # so the full mesh never needs to be materialized
+                separable = True
+                axis_lens = tuple(
+                    len(np.atleast_1d(axis))
+                    for axis in (x, y, z)[: self.model.dim]
+                )
         if self.model.do_rotation:
             x, y, z = unrotate_mesh(self.model.dim, self.model.angles, x, y, z)
             c_x, c_y, c_z = unrotate_mesh(
@@ -100,17 +139,88 @@ class Ordinary(Field):
         y, z = make_isotropic(self.model.dim, self.model.anis, y, z)
         c_y, c_z = make_isotropic(self.model.dim, self.model.anis, c_y, c_z)
 
+        # stack the condition positions once, reusing the buffer
+        c_stack = self._cond_stack = _stack_pos(
+            (c_x, c_y, c_z),
+            self.model.dim,
+            out=self._cond_stack,
+            dtype=self.dtype,
+        )
         # set condtions
-        cond = np.concatenate((self.cond_val, [0]))
-        krig_mat = inv(self._get_krig_mat((c_x, c_y, c_z), (c_x, c_y, c_z)))
-        krig_vecs = self._get_vario_mat((c_x, c_y, c_z), (x, y, z), add=True)
-        # generate the kriged field
-        field, krige_var = krigesum(krig_mat, krig_vecs, cond)
+        cond = self.krige_cond
+        # keep the raw kriging matrix accessible for diagnostics
+        self._krige_mat = self._get_krig_mat(c_stack)
+        # factor once, solve per right-hand side afterwards
+        # (finite by construction, so the input checks can be skipped)
+        krig_fac = lu_factor(self._krige_mat, check_finite=False)
+        # generate the kriged field in chunks
+        axes = (x, y, z)[: self.model.dim]
+        point_no = int(np.prod(axis_lens)) if separable else len(x)
+        if separable:
+            # squared distances to the conditions, separated per axis
+            ax_d2 = [
+                (c_stack[:, d, None] - np.atleast_1d(axes[d])[None, :]) ** 2
+                for d in range(self.model.dim)
+            ]
+        if parallel and chunk_size is None:
+            # distribute the points evenly over the threads
+            chunk_size = int(np.ceil(point_no / (os.cpu_count() or 1)))
+        chunks = chunk_slices(point_no, chunk_size)
+        field = np.empty(point_no, dtype=self.dtype)
+        krige_var = np.empty(point_no, dtype=self.dtype)
+        # recycle one scratch buffer over all sequentially processed
+        # chunks (concurrent chunks need their own buffers)
+        k_buf = None
+        if not parallel and not separable and len(chunks) > 1:
+            k_buf = np.empty(
+                (c_stack.shape[0], chunks[0].stop - chunks[0].start),
+                dtype=self.dtype,
+            )
+
+        def calc_chunk(chunk):
+            """Solve the kriging system for a single chunk of the mesh."""
+            if separable:
+                idx = np.unravel_index(
+                    np.arange(chunk.start, chunk.stop), axis_lens
+                )
+                d2 = ax_d2[0][:, idx[0]]
+                for d in range(1, self.model.dim):
+                    d2 += ax_d2[d][:, idx[d]]
+                krig_vecs = self._add_unbiased(
+                    self.model.vario_nugget(np.sqrt(d2)).astype(
+                        self.dtype, copy=False
+                    )
+                )
+            else:
+                out = None
+                if k_buf is not None:
+                    # the last chunk may be shorter: slice a view
+                    out = k_buf[:, : chunk.stop - chunk.start]
+                krig_vecs = self._get_vario_mat(
+                    (c_x, c_y, c_z),
+                    tuple(axis[chunk] for axis in axes),
+                    add=True,
+                    pos1_stack=c_stack,
+                    out=out,
+                )
+            field[chunk], krige_var[chunk] = krigesum_factored(
+                krig_fac, krig_vecs, cond
+            )
+
+        if parallel:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                list(executor.map(calc_chunk, chunks))
+        else:
+            for chunk in chunks:
+                calc_chunk(chunk)
         # calculate the estimated mean (kriging field at infinity)
-        mean_est = np.concatenate(
-            (np.full_like(self.cond_val, self.model.sill), [1])
+        mean_est = np.full(cond.size, self.model.sill, dtype=self.dtype)
+        mean_est[-1] = 1.0
+        # mean_est is a throw-away right-hand side: solve in place
+        self.mean = np.dot(
+            cond,
+            lu_solve(krig_fac, mean_est, overwrite_b=True, check_finite=False),
         )
-        self.mean = np.einsum("i,ij,j", cond, krig_mat, mean_est)
 
         # reshape field if we got an unstructured mesh
         if mesh_type_changed:
@@ -126,24 +236,49 @@ class Ordinary(Field):
         self.field = field
         return self.field, self.krige_var
 
-    def _get_krig_mat(self, pos1, pos2):
-        size = pos1[0].size
-        res = np.empty((size + 1, size + 1), dtype=np.double)
-        res[:size, :size] = self._get_vario_mat(pos1, pos2)
+    def _get_krig_mat(self, cond_stack):
+        size = cond_stack.shape[0]
+        res = np.empty((size + 1, size + 1), dtype=self.dtype)
+        res[:size, :size] = self._get_vario_mat(
+            None, None, pos1_stack=cond_stack, pos2_stack=cond_stack
+        )
         res[size, :] = 1
         res[:, size] = 1
         res[size, size] = 0
         return res
 
-    def _get_vario_mat(self, pos1, pos2, add=False):
-        res = self.model.vario_nugget(
-            cdist(
-                np.column_stack(pos1[: self.model.dim]),
-                np.column_stack(pos2[: self.model.dim]),
+    def _get_vario_mat(
+        self, pos1, pos2, add=False, pos1_stack=None, pos2_stack=None, out=None
+    ):
+        if pos1_stack is None:
+            pos1_stack = _stack_pos(pos1, self.model.dim, dtype=self.dtype)
+        if pos2_stack is None:
+            pos2_stack = _stack_pos(pos2, self.model.dim, dtype=self.dtype)
+        # "out" only recycles the distance buffer here, the variogram
+        # evaluation still allocates its result
+        # (and may upcast, so enforce the wanted precision)
+        vario = self.model.vario_nugget(
+            get_dists(
+                pos1,
+                pos2,
+                self.model.dim,
+                pos1_stack=pos1_stack,
+                pos2_stack=pos2_stack,
+                out=out,
             )
-        )
+        ).astype(self.dtype, copy=False)
         if add:
-            return np.vstack((res, np.ones((1, res.shape[1]))))
+            return self._add_unbiased(vario)
+        return vario
+
+    @staticmethod
+    def _add_unbiased(vario):
+        """Write variogram and unbiasedness row into one block."""
+        res = np.empty(
+            (vario.shape[0] + 1, vario.shape[1]), dtype=vario.dtype
+        )
+        res[:-1] = vario
+        res[-1] = 1
         return res
 
     def set_condition(self, cond_pos, cond_val):
@@ -159,6 +294,21 @@ class Ordinary(Field):
         self._cond_pos, self._cond_val = set_condition(
             cond_pos, cond_val, self.model.dim
         )
+        if not np.all(np.isfinite(self._cond_val.astype(self.dtype))):
+            raise ValueError(
+                "Ordinary: 'cond_val' does not fit into the given 'dtype'."
+            )
+        # cache the condition values augmented by the unbiasedness entry
+        cond_no = len(self._cond_val)
+        if self._krige_cond is None or len(self._krige_cond) != cond_no + 1:
+            # the zero tail is only ever written here
+            self._krige_cond = np.zeros(cond_no + 1, dtype=self.dtype)
+        self._krige_cond[:cond_no] = self._cond_val
+
+    @property
+    def krige_cond(self):
+        """:class:`numpy.ndarray`: The condition values for the kriging system."""
+        return self._krige_cond
 
     @property
     def cond_pos(self):
@@ -13,9 +13,12 @@ The following classes are provided
 from __future__ import division, absolute_import, print_function
 
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from scipy.linalg import inv
-from scipy.spatial.distance import cdist
+from scipy.linalg import lu_factor, cho_factor, LinAlgError
+from scipy.spatial import cKDTree
 
 from gstools.field.tools import (
     check_mesh,
@@ -24,10 +27,23 @@ from gstools.field.tools import (
     reshape_axis_from_struct_to_unstruct,
     reshape_field_from_unstruct_to_struct,
 )
+from gstools.covmodel.models import Gaussian
 from gstools.field.base import Field
 from gstools.tools.geometric import pos2xyz, xyz2pos
-from gstools.krige.krigesum import krigesum
-from gstools.krige.tools import set_condition
+from gstools.krige.tools import (
+    set_condition,
+    get_dists,
+    compact_cov_mat,
+    gau_cov_mat,
+    packed_cov_chol,
+    krigesum_factored,
+    krigesum_chol,
+    krigesum_packed,
+    chunk_slices,
+    _stack_pos,
+    _TREE_MIN,
+    _PACKED_MIN,
+)
 
 __all__ = ["Simple"]
 
@@ -46,18 +62,32 @@ class Simple(Field):
         tuple, containing the given condition positions (x, [y, z])
     cond_val : :class:`numpy.ndarray`
         the values of the conditions
+    dtype : data-type, optional
+        floating point data-type used for the kriging system.
+        :class:`numpy.float32` halves the memory traffic of the
+        chunked evaluation at the cost of precision.
+        Default: :class:`numpy.double`
     """
 
-    def __init__(self, model, mean, cond_pos, cond_val):
+    def __init__(self, model, mean, cond_pos, cond_val, dtype=np.double):
         super(Simple, self).__init__(model, mean)
         self.krige_var = None
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != "f":
+            raise ValueError(
+                "Simple: 'dtype' needs to be a floating point type."
+            )
         # initialize private attributes
         self._value_type = "scalar"
         self._cond_pos = None
         self._cond_val = None
+        self._krige_mat = None
+        self._cond_stack = None
         self.set_condition(cond_pos, cond_val)
 
-    def __call__(self, pos, mesh_type="unstructured"):
+    def __call__(
+        self, pos, mesh_type="unstructured", chunk_size=None, parallel=False
+    ):
         """
         Generate the simple kriging field.
 
@@ -70,6 +100,13 @@ class Simple(Field):
             directions (x, [y, z])
         mesh_type : :class:`str`
             'structured' / 'unstructured'
+        chunk_size : :class:`int` or :any:`None`, optional
+            Chunk the given points to limit the memory consumption.
+            If None, all points are processed at once. Default: None
+        parallel : :class:`bool`, optional
+            Process the chunks with a thread pool. Since each chunk
+            produces an independent slice of the field, this scales with
+            the number of cores. Default: False
 
         Returns
         -------
@@ -79,22 +116,32 @@ class Simple(Field):
             the kriging error variance
         """
         # internal conversation
-        x, y, z = pos2xyz(pos, dtype=np.double, max_dim=self.model.dim)
+        x, y, z = pos2xyz(pos, dtype=self.dtype, max_dim=self.model.dim)
         c_x, c_y, c_z = pos2xyz(
-            self.cond_pos, dtype=np.double, max_dim=self.model.dim
+            self.cond_pos, dtype=self.dtype, max_dim=self.model.dim
         )
         self.pos = xyz2pos(x, y, z)
         self.mesh_type = mesh_type
         # format the positional arguments of the mesh
         check_mesh(self.model.dim, x, y, z, mesh_type)
         mesh_type_changed = False
+        separable = False
         if mesh_type == "structured":
             mesh_type_changed = True
             mesh_type_old = mesh_type
             mesh_type = "unstructured"
-            x, y, z, axis_lens = reshape_axis_from_struct_to_unstruct(
-                self.model.dim, x, y, z
-            )
+            if self.model.do_rotation:
+                x, y, z, axis_lens = reshape_axis_from_struct_to_unstruct(
+                    self.model.dim, x, y, z
+                )
+            else:
+                # without rotation, distances separate along the axes,
+                # so the full mesh never needs to be materialized
+                separable = True
+                axis_lens = tuple(
+                    len(np.atleast_1d(axis))
+                    for axis in (x, y, z)[: self.model.dim]
+                )
         if self.model.do_rotation:
             x, y, z = unrotate_mesh(self.model.dim, self.model.angles, x, y, z)
             c_x, c_y, c_z = unrotate_mesh(
@@ -103,12 +150,109 @@ class Simple(Field):
         y, z = make_isotropic(self.model.dim, self.model.anis, y, z)
         c_y, c_z = make_isotropic(self.model.dim, self.model.anis, c_y, c_z)
 
+        # stack the condition positions once, reusing the buffer
+        c_stack = self._cond_stack = _stack_pos(
+            (c_x, c_y, c_z),
+            self.model.dim,
+            out=self._cond_stack,
+            dtype=self.dtype,
+        )
+        # build the condition k-d tree once, it is fixed over all chunks
+        c_tree = cKDTree(c_stack) if self.model.has_finite_range else None
         # set condtions to zero mean
-        cond = self.cond_val - self.mean
-        krig_mat = inv(self._get_cov_mat((c_x, c_y, c_z), (c_x, c_y, c_z)))
-        krig_vecs = self._get_cov_mat((c_x, c_y, c_z), (x, y, z))
-        # generate the kriged field
-        field, krige_var = krigesum(krig_mat, krig_vecs, cond)
+        cond = (self.cond_val - self.mean).astype(self.dtype, copy=False)
+        # factor once, solve per right-hand side afterwards
+        krig_fac = packed_fac = None
+        use_chol = False
+        if c_stack.shape[0] >= _PACKED_MIN:
+            # packed triangular storage halves memory for many conditions
+            packed_fac = packed_cov_chol(self.model, c_stack)
+            self._krige_mat = None
+        if packed_fac is None:
+            # keep the raw kriging matrix accessible for diagnostics
+            self._krige_mat = self._get_cov_mat(
+                (c_x, c_y, c_z),
+                (c_x, c_y, c_z),
+                pos1_stack=c_stack,
+                pos2_stack=c_stack,
+                pos1_tree=c_tree,
+                pos2_tree=c_tree,
+            )
+            # the simple-kriging matrix is SPD: Cholesky is the first choice
+            # (finite by construction, so the input checks can be skipped)
+            try:
+                krig_fac = cho_factor(
+                    self._krige_mat, lower=True, check_finite=False
+                )[0]
+                use_chol = True
+            except LinAlgError:
+                # keep LU as a safety net for numerically non-PD matrices
+                krig_fac = lu_factor(self._krige_mat, check_finite=False)
+        # generate the kriged field in chunks
+        axes = (x, y, z)[: self.model.dim]
+        point_no = int(np.prod(axis_lens)) if separable else len(x)
+        if separable:
+            # squared distances to the conditions, separated per axis
+            ax_d2 = [
+                (c_stack[:, d, None] - np.atleast_1d(axes[d])[None, :]) ** 2
+                for d in range(self.model.dim)
+            ]
+        if parallel and chunk_size is None:
+            # distribute the points evenly over the threads
+            chunk_size = int(np.ceil(point_no / (os.cpu_count() or 1)))
+        chunks = chunk_slices(point_no, chunk_size)
+        field = np.empty(point_no, dtype=self.dtype)
+        krige_var = np.empty(point_no, dtype=self.dtype)
+        # recycle one scratch buffer over all sequentially processed
+        # chunks (concurrent chunks need their own buffers)
+        k_buf = None
+        if not parallel and not separable and len(chunks) > 1:
+            k_buf = np.empty(
+                (c_stack.shape[0], chunks[0].stop - chunks[0].start),
+                dtype=self.dtype,
+            )
+
+        def calc_chunk(chunk):
+            """Solve the kriging system for a single chunk of the mesh."""
+            if separable:
+                idx = np.unravel_index(
+                    np.arange(chunk.start, chunk.stop), axis_lens
+                )
+                d2 = ax_d2[0][:, idx[0]]
+                for d in range(1, self.model.dim):
+                    d2 += ax_d2[d][:, idx[d]]
+                krig_vecs = self._cov_from_d2(d2)
+            else:
+                out = None
+                if k_buf is not None:
+                    # the last chunk may be shorter: slice a view
+                    out = k_buf[:, : chunk.stop - chunk.start]
+                krig_vecs = self._get_cov_mat(
+                    (c_x, c_y, c_z),
+                    tuple(axis[chunk] for axis in axes),
+                    pos1_stack=c_stack,
+                    pos1_tree=c_tree,
+                    out=out,
+                )
+            if packed_fac is not None:
+                field[chunk], krige_var[chunk] = krigesum_packed(
+                    packed_fac, krig_vecs, cond
+                )
+            elif use_chol:
+                field[chunk], krige_var[chunk] = krigesum_chol(
+                    krig_fac, krig_vecs, cond
+                )
+            else:
+                field[chunk], krige_var[chunk] = krigesum_factored(
+                    krig_fac, krig_vecs, cond
+                )
+
+        if parallel:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+                list(executor.map(calc_chunk, chunks))
+        else:
+            for chunk in chunks:
+                calc_chunk(chunk)
 
         # reshape field if we got an unstructured mesh
         if mesh_type_changed:
@@ -125,13 +269,57 @@ class Simple(Field):
         self.field = field + self.mean
         return self.field, self.krige_var
 
-    def _get_cov_mat(self, pos1, pos2):
+    def _get_cov_mat(
+        self,
+        pos1,
+        pos2,
+        pos1_stack=None,
+        pos2_stack=None,
+        pos1_tree=None,
+        pos2_tree=None,
+        out=None,
+    ):
+        if pos1_stack is None:
+            pos1_stack = _stack_pos(pos1, self.model.dim, dtype=self.dtype)
+        if pos2_stack is None:
+            pos2_stack = _stack_pos(pos2, self.model.dim, dtype=self.dtype)
+        # compactly supported models only need pairs within the range
+        if (
+            self.model.has_finite_range
+            and pos1_stack.shape[0] * pos2_stack.shape[0] >= _TREE_MIN
+        ):
+            return compact_cov_mat(
+                self.model,
+                pos1_stack,
+                pos2_stack,
+                tree1=pos1_tree,
+                tree2=pos2_tree,
+            )
+        # the gaussian covariance can be fused with the distance calculation
+        if type(self.model) is Gaussian:
+            return gau_cov_mat(self.model, pos1_stack, pos2_stack, out=out)
+        # "out" only recycles the distance buffer here,
+        # the covariance evaluation still allocates its result
+        # (and may upcast, so enforce the wanted precision)
         return self.model.cov_nugget(
-            cdist(
-                np.column_stack(pos1[: self.model.dim]),
-                np.column_stack(pos2[: self.model.dim]),
+            get_dists(
+                pos1,
+                pos2,
+                self.model.dim,
+                pos1_stack=pos1_stack,
+                pos2_stack=pos2_stack,
+                out=out,
             )
-        )
+        ).astype(self.dtype, copy=False)
+
+    def _cov_from_d2(self, d2):
+        """Covariance (respecting nugget) from squared distances."""
+        if type(self.model) is Gaussian:
+            res = self.model.var * self.model.cor_from_d2(d2)
+            res[d2 <= 1e-16] = self.model.sill
+        else:
+            res = self.model.cov_nugget(np.sqrt(d2))
+        return res.astype(self.dtype, copy=False)
 
     def set_condition(self, cond_pos, cond_val):
         """Set the conditions for kriging.
@@ -146,6 +334,10 @@ class Simple(Field):
         self._cond_pos, self._cond_val = set_condition(
             cond_pos, cond_val, self.model.dim
         )
+        if not np.all(np.isfinite(self._cond_val.astype(self.dtype))):
+            raise ValueError(
+                "Simple: 'cond_val' does not fit into the given 'dtype'."
+            )
 
     @property
     def cond_pos(self):
@@ -8,14 +8,499 @@ The following classes and functions are provided
 
 .. autosummary::
    set_condition
+   get_dists
+   compact_cov_mat
+   gau_cov_mat
+   packed_cov_chol
+   krigesum_factored
+   krigesum_chol
+   krigesum_packed
+   chunk_slices
 """
 # pylint: disable=C0103
 from __future__ import print_function, division, absolute_import
 
 import numpy as np
+from scipy.linalg import lu_solve, cho_solve
+from scipy.linalg.lapack import dpptrf, dpptrs, spptrf, spptrs
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
+
 from gstools.tools.geometric import pos2xyz, xyz2pos
 
-__all__ = ["set_condition"]
+try:
+    from numba import njit, prange
+
+    NUMBA = True
+except ImportError:  # pragma: no cover
+    NUMBA = False
+
+__all__ = [
+    "set_condition",
+    "get_dists",
+    "compact_cov_mat",
+    "gau_cov_mat",
+    "packed_cov_chol",
+    "krigesum_factored",
+    "krigesum_chol",
+    "krigesum_packed",
+    "chunk_slices",
+]
+
+
+# block edge-length for the tiled distance kernel
+# 64 * 64 * 8 B * 2 arrays = 64 KB, which roughly fits the L1/L2 caches
+_BLOCK = 64
+# minimal size of both point sets to make tiling worthwhile
+_BLOCK_MIN = 4 * _BLOCK
+# minimal number of point pairs to make the k-d tree assembly worthwhile
+_TREE_MIN = 1 << 18
+# minimal number of conditions to use packed (triangular) matrix storage
+_PACKED_MIN = 2048
+
+
+# all hot-path kernels are compiled with nogil=True, so the chunk-wise
+# thread pool used by the kriging classes can genuinely overlap them
+
+if NUMBA:
+
+    @njit(fastmath=True, nogil=True, cache=True, inline="always")
+    def _euclid(pos1, i, pos2, j, dim):  # pragma: no cover
+        """Euclidean distance of the points pos1[i] and pos2[j]."""
+        if dim == 1:
+            return abs(pos1[i, 0] - pos2[j, 0])
+        if dim == 2:
+            d0 = pos1[i, 0] - pos2[j, 0]
+            d1 = pos1[i, 1] - pos2[j, 1]
+            return np.sqrt(d0 * d0 + d1 * d1)
+        if dim == 3:
+            d0 = pos1[i, 0] - pos2[j, 0]
+            d1 = pos1[i, 1] - pos2[j, 1]
+            d2 = pos1[i, 2] - pos2[j, 2]
+            return np.sqrt(d0 * d0 + d1 * d1 + d2 * d2)
+        dist = 0.0
+        for d in range(dim):
+            diff = pos1[i, d] - pos2[j, d]
+            dist += diff * diff
+        return np.sqrt(dist)
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cdist_euclid(pos1, pos2, out):  # pragma: no cover
+        """Pairwise euclidean distances of stacked (N, dim) point arrays."""
+        dim = pos1.shape[1]
+        for i in prange(pos1.shape[0]):
+            for j in range(pos2.shape[0]):
+                out[i, j] = _euclid(pos1, i, pos2, j, dim)
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cdist_d1(pos1, pos2, out):  # pragma: no cover
+        """Pairwise distances in 1D: no sum, no sqrt."""
+        for i in prange(pos1.shape[0]):
+            for j in range(pos2.shape[0]):
+                out[i, j] = abs(pos1[i, 0] - pos2[j, 0])
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cdist_d2(pos1, pos2, out):  # pragma: no cover
+        """Pairwise euclidean distances in 2D with unrolled inner sum."""
+        for i in prange(pos1.shape[0]):
+            for j in range(pos2.shape[0]):
+                d0 = pos1[i, 0] - pos2[j, 0]
+                d1 = pos1[i, 1] - pos2[j, 1]
+                out[i, j] = np.sqrt(d0 * d0 + d1 * d1)
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cdist_d3(pos1, pos2, out):  # pragma: no cover
+        """Pairwise euclidean distances in 3D with unrolled inner sum."""
+        for i in prange(pos1.shape[0]):
+            for j in range(pos2.shape[0]):
+                d0 = pos1[i, 0] - pos2[j, 0]
+                d1 = pos1[i, 1] - pos2[j, 1]
+                d2 = pos1[i, 2] - pos2[j, 2]
+                out[i, j] = np.sqrt(d0 * d0 + d1 * d1 + d2 * d2)
+
+    # runtime dispatch on the dimension of the stacked positions
+    _KERNELS = {1: _cdist_d1, 2: _cdist_d2, 3: _cdist_d3}
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cdist_packed(pos, out):  # pragma: no cover
+        """Upper-triangle self-distances in LAPACK packed storage."""
+        dim = pos.shape[1]
+        for j in prange(pos.shape[0]):
+            base = j * (j + 1) // 2
+            for i in range(j + 1):
+                out[base + i] = _euclid(pos, i, pos, j, dim)
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cov_mat_gau(pos1, pos2, var, len_scale, sill, out):  # pragma: no cover
+        """Fused squared-distance + Gaussian covariance matrix (no sqrt)."""
+        dim = pos1.shape[1]
+        fac = -np.pi / 4.0 / (len_scale * len_scale)
+        for i in prange(pos1.shape[0]):
+            for j in range(pos2.shape[0]):
+                d2 = 0.0
+                for d in range(dim):
+                    diff = pos1[i, d] - pos2[j, d]
+                    d2 += diff * diff
+                if d2 <= 1e-16:  # matches np.isclose(r, 0) in cov_nugget
+                    out[i, j] = sill
+                else:
+                    out[i, j] = var * np.exp(fac * d2)
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _krigesum_chol(chol, krig_vecs, cond, field, error):  # pragma: no cover
+        """Kriging sums via forward/back substitution per kriging vector."""
+        size = chol.shape[0]
+        for k in prange(krig_vecs.shape[1]):
+            # empty_like keeps the working precision of the inputs
+            tmp = np.empty_like(krig_vecs[:, k])
+            # forward substitution: chol @ tmp = krig_vecs[:, k]
+            for i in range(size):
+                acc = krig_vecs[i, k]
+                for j in range(i):
+                    acc -= chol[i, j] * tmp[j]
+                tmp[i] = acc / chol[i, i]
+            # error = vecs.T @ mat^-1 @ vecs = tmp.T @ tmp
+            err = 0.0
+            for i in range(size):
+                err += tmp[i] * tmp[i]
+            # back substitution: chol.T @ x = tmp (reusing tmp as x)
+            for i in range(size - 1, -1, -1):
+                acc = tmp[i]
+                for j in range(i + 1, size):
+                    acc -= chol[j, i] * tmp[j]
+                tmp[i] = acc / chol[i, i]
+            fld = 0.0
+            for i in range(size):
+                fld += cond[i] * tmp[i]
+            field[k] = fld
+            error[k] = err
+
+    @njit(parallel=True, fastmath=True, nogil=True, cache=True)
+    def _cdist_euclid_blocked(pos1, pos2, out):  # pragma: no cover
+        """Cache-blocked pairwise euclidean distances for big point sets."""
+        dim = pos1.shape[1]
+        n1 = pos1.shape[0]
+        n2 = pos2.shape[0]
+        for bi in prange((n1 + _BLOCK - 1) // _BLOCK):
+            i0 = bi * _BLOCK
+            i1 = min(i0 + _BLOCK, n1)
+            # one (BLOCK, dim) slice of pos2 stays hot over multiple rows
+            for j0 in range(0, n2, _BLOCK):
+                j1 = min(j0 + _BLOCK, n2)
+                for i in range(i0, i1):
+                    for j in range(j0, j1):
+                        out[i, j] = _euclid(pos1, i, pos2, j, dim)
+
+
+def _stack_pos(pos, max_dim=3, out=None, dtype=np.double):
+    """Stack a position tuple into a contiguous (n, max_dim) array.
+
+    If ``out`` is a matching pre-allocated buffer, the axes are filled
+    by slice assignment, turning allocate+copy into copy-only.
+    """
+    size = len(pos[0])
+    if out is None or out.shape != (size, max_dim) or out.dtype != dtype:
+        out = np.empty((size, max_dim), dtype=dtype)
+    for i in range(max_dim):
+        out[:, i] = pos[i]
+    return out
+
+
+def get_dists(pos1, pos2, max_dim=3, pos1_stack=None, pos2_stack=None, out=None):
+    """Calculate pairwise distances of two sets of positions.
+
+    Parameters
+    ----------
+    pos1 : :class:`list`
+        the position tuple of the first set (x, [y, z])
+    pos2 : :class:`list`
+        the position tuple of the second set (x, [y, z])
+    max_dim : :class:`int`, optional
+        Cut of information above the given dimension. Default: 3
+    pos1_stack : :class:`numpy.ndarray` or :any:`None`, optional
+        already stacked version of pos1 with shape (n1, max_dim).
+        Can be given to prevent re-stacking fixed positions. Default: None
+    pos2_stack : :class:`numpy.ndarray` or :any:`None`, optional
+        already stacked version of pos2 with shape (n2, max_dim).
+        Can be given to prevent re-stacking fixed positions. Default: None
+    out : :class:`numpy.ndarray` or :any:`None`, optional
+        recyclable output buffer with shape (n1, n2).
+        Can be given to prevent repeated allocations when evaluating
+        many equally sized chunks. Reallocated on shape mismatch.
+        Default: None
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Matrix containing the pairwise distances.
+    """
+    if pos1_stack is None:
+        pos1_stack = _stack_pos(pos1, max_dim)
+    if pos2_stack is None:
+        pos2_stack = _stack_pos(pos2, max_dim)
+    dtype = pos1_stack.dtype
+    if NUMBA:
+        n1, n2 = pos1_stack.shape[0], pos2_stack.shape[0]
+        if out is None or out.shape != (n1, n2) or out.dtype != dtype:
+            out = np.empty((n1, n2), dtype=dtype)
+        if min(n1, n2) >= _BLOCK_MIN:
+            _cdist_euclid_blocked(pos1_stack, pos2_stack, out)
+        else:
+            kernel = _KERNELS.get(pos1_stack.shape[1], _cdist_euclid)
+            kernel(pos1_stack, pos2_stack, out)
+        return out
+    # fallback, if numba is not installed (cdist allocates its own output)
+    return cdist(pos1_stack, pos2_stack).astype(dtype, copy=False)
+
+
+def compact_cov_mat(model, pos1_stack, pos2_stack, tree1=None, tree2=None):
+    """Covariance matrix of a compactly supported model via a k-d tree.
+
+    For models with :any:`CovModel.has_finite_range`, the covariance of
+    all point pairs further apart than the length scale is exactly zero.
+    Instead of evaluating the full pairwise problem, only the pairs
+    within the model range are gathered by
+    :any:`scipy.spatial.cKDTree.sparse_distance_matrix` and evaluated.
+
+    Parameters
+    ----------
+    model : :any:`CovModel`
+        Covariance Model with compact support.
+    pos1_stack : :class:`numpy.ndarray`
+        stacked positions of the first set with shape (n1, dim)
+    pos2_stack : :class:`numpy.ndarray`
+        stacked positions of the second set with shape (n2, dim)
+    tree1 : :class:`scipy.spatial.cKDTree` or :any:`None`, optional
+        prebuilt k-d tree of pos1_stack. Can be given to prevent
+        rebuilding the tree of fixed positions. Default: None
+    tree2 : :class:`scipy.spatial.cKDTree` or :any:`None`, optional
+        prebuilt k-d tree of pos2_stack. Can be given to prevent
+        rebuilding the tree of fixed positions. Default: None
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Matrix containing the pairwise covariances.
+    """
+    res = np.zeros(
+        (pos1_stack.shape[0], pos2_stack.shape[0]), dtype=pos1_stack.dtype
+    )
+    if tree1 is None:
+        tree1 = cKDTree(pos1_stack)
+    if tree2 is None:
+        tree2 = cKDTree(pos2_stack)
+    pairs = tree1.sparse_distance_matrix(
+        tree2, model.len_scale, output_type="ndarray"
+    )
+    res[pairs["i"], pairs["j"]] = model.cov_nugget(pairs["v"])
+    return res
+
+
+def gau_cov_mat(model, pos1_stack, pos2_stack, out=None):
+    """Covariance matrix of a Gaussian model from squared distances.
+
+    The Gaussian correlation only depends on the squared distance, so
+    distance and covariance are fused into a single pass that never
+    materializes the distance matrix and skips the square root.
+
+    Parameters
+    ----------
+    model : :any:`Gaussian`
+        Gaussian covariance model.
+    pos1_stack : :class:`numpy.ndarray`
+        stacked positions of the first set with shape (n1, dim)
+    pos2_stack : :class:`numpy.ndarray`
+        stacked positions of the second set with shape (n2, dim)
+    out : :class:`numpy.ndarray` or :any:`None`, optional
+        recyclable output buffer with shape (n1, n2).
+        Can be given to prevent repeated allocations when evaluating
+        many equally sized chunks. Reallocated on shape mismatch.
+        Default: None
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Matrix containing the pairwise covariances
+        respecting the nugget at zero distance.
+    """
+    if NUMBA:
+        shape = (pos1_stack.shape[0], pos2_stack.shape[0])
+        dtype = pos1_stack.dtype
+        if out is None or out.shape != shape or out.dtype != dtype:
+            out = np.empty(shape, dtype=dtype)
+        _cov_mat_gau(
+            pos1_stack,
+            pos2_stack,
+            model.var,
+            model.len_scale,
+            model.sill,
+            out,
+        )
+        return out
+    # fallback, if numba is not installed
+    d2 = cdist(pos1_stack, pos2_stack, "sqeuclidean")
+    res = model.var * model.cor_from_d2(d2)
+    res[d2 <= 1e-16] = model.sill
+    return res.astype(pos1_stack.dtype, copy=False)
+
+
+def krigesum_factored(krig_fac, krig_vecs, cond):
+    """Calculate the kriging field and error from a factored kriging matrix.
+
+    Parameters
+    ----------
+    krig_fac : :class:`tuple`
+        LU factorization of the kriging matrix
+        as returned by :any:`scipy.linalg.lu_factor`
+    krig_vecs : :class:`numpy.ndarray`
+        Matrix containing the kriging vectors of all target points.
+    cond : :class:`numpy.ndarray`
+        the (augmented) condition values
+
+    Returns
+    -------
+    field : :class:`numpy.ndarray`
+        the kriged field
+    error : :class:`numpy.ndarray`
+        the kriging error summands
+    """
+    # solve for all kriging vectors at once: O(n^2) per right-hand side
+    # all inputs are finite by construction, so skip the O(n*m) check;
+    # krig_vecs is still needed for the error sum and must not be overwritten
+    solved = lu_solve(krig_fac, krig_vecs, check_finite=False)
+    field = np.dot(cond, solved)
+    error = np.einsum("ij,ij->j", krig_vecs, solved)
+    return field, error
+
+
+def packed_cov_chol(model, pos_stack):
+    """Packed Cholesky factor of the condition covariance matrix.
+
+    Only the upper triangle of the symmetric covariance matrix is built
+    (in LAPACK packed storage) and factored in place by ``pptrf``
+    (in the precision of the given positions),
+    halving the memory footprint compared to the dense factorization.
+
+    Parameters
+    ----------
+    model : :any:`CovModel`
+        Covariance Model used for kriging.
+    pos_stack : :class:`numpy.ndarray`
+        stacked condition positions with shape (n, dim)
+
+    Returns
+    -------
+    :class:`numpy.ndarray` or :any:`None`
+        The packed Cholesky factor or None if the factorization failed.
+    """
+    size = pos_stack.shape[0]
+    dtype = pos_stack.dtype
+    if NUMBA:
+        dists = np.empty(size * (size + 1) // 2, dtype=dtype)
+        _cdist_packed(pos_stack, dists)
+    else:
+        # fallback, if numba is not installed
+        full = get_dists(
+            None,
+            None,
+            pos_stack.shape[1],
+            pos1_stack=pos_stack,
+            pos2_stack=pos_stack,
+        )
+        # tril indices in row-major order match packed upper storage
+        # column-by-column, since the matrix is symmetric
+        dists = full[np.tril_indices(size)]
+    pptrf = dpptrf if dtype == np.double else spptrf
+    cov = model.cov_nugget(dists).astype(dtype, copy=False)
+    fac, info = pptrf(size, cov, overwrite_ap=1)
+    return fac if info == 0 else None
+
+
+def krigesum_packed(packed_fac, krig_vecs, cond):
+    """Calculate the kriging field and error from a packed Cholesky factor.
+
+    Parameters
+    ----------
+    packed_fac : :class:`numpy.ndarray`
+        packed Cholesky factor as returned by :any:`packed_cov_chol`
+    krig_vecs : :class:`numpy.ndarray`
+        Matrix containing the kriging vectors of all target points.
+    cond : :class:`numpy.ndarray`
+        the condition values
+
+    Returns
+    -------
+    field : :class:`numpy.ndarray`
+        the kriged field
+    error : :class:`numpy.ndarray`
+        the kriging error summands
+    """
+    pptrs = dpptrs if packed_fac.dtype == np.double else spptrs
+    solved, info = pptrs(cond.size, packed_fac, krig_vecs)
+    if info != 0:  # pragma: no cover
+        raise ValueError("krigesum_packed: triangular solve failed")
+    field = np.dot(cond, solved)
+    error = np.einsum("ij,ij->j", krig_vecs, solved)
+    return field, error
+
+
+def krigesum_chol(chol, krig_vecs, cond):
+    """Calculate the kriging field and error from a Cholesky factor.
+
+    Parameters
+    ----------
+    chol : :class:`numpy.ndarray`
+        lower Cholesky factor of the kriging matrix
+        as returned by ``scipy.linalg.cho_factor(..., lower=True)[0]``
+    krig_vecs : :class:`numpy.ndarray`
+        Matrix containing the kriging vectors of all target points.
+    cond : :class:`numpy.ndarray`
+        the condition values
+
+    Returns
+    -------
+    field : :class:`numpy.ndarray`
+        the kriged field
+    error : :class:`numpy.ndarray`
+        the kriging error summands
+    """
+    if NUMBA:
+        field = np.empty(krig_vecs.shape[1], dtype=krig_vecs.dtype)
+        error = np.empty(krig_vecs.shape[1], dtype=krig_vecs.dtype)
+        _krigesum_chol(chol, krig_vecs, cond, field, error)
+        return field, error
+    # fallback, if numba is not installed
+    # all inputs are finite by construction, so skip the O(n*m) check;
+    # krig_vecs is still needed for the error sum and must not be overwritten
+    solved = cho_solve((chol, True), krig_vecs, check_finite=False)
+    field = np.dot(cond, solved)
+    error = np.einsum("ij,ij->j", krig_vecs, solved)
+    return field, error
+
+
+def chunk_slices(point_no, chunk_size=None):
+    """Create slices for a chunk-wise evaluation of a point set.
+
+    Parameters
+    ----------
+    point_no : :class:`int`
+        number of points to be chunked
+    chunk_size : :class:`int` or :any:`None`, optional
+        maximal size of each chunk. If None, a single chunk covering
+        all points is returned. Default: None
+
+    Returns
+    -------
+    :class:`list` of :class:`slice`
+        slices selecting the single chunks.
+    """
+    if chunk_size is None or chunk_size >= point_no:
+        return [slice(0, point_no)]
+    chunk_no = int(np.ceil(point_no / float(chunk_size)))
+    return [
+        slice(i * chunk_size, min((i + 1) * chunk_size, point_no))
+        for i in range(chunk_no)
+    ]
 
 
 def set_condition(cond_pos, cond_val, max_dim=3):
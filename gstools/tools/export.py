@@ -42,6 +42,10 @@ __all__ = [
 
 def _vtk_structured_helper(pos, fields):
     """An internal helper to extract what is needed for the vtk rectilinear grid
+
+    VTK needs the fields in fortran order. np.ravel only returns a view
+    if the field already is F-contiguous and copies otherwise, so
+    producing fields F-contiguous gives a zero-copy export.
     """
     if not isinstance(fields, dict):
         fields = {"field": fields}
@@ -52,7 +56,7 @@ def _vtk_structured_helper(pos, fields):
         z = np.array([0])
     # need fortran order in VTK
     for field in fields:
-        fields[field] = fields[field].reshape(-1, order="F")
+        fields[field] = np.ravel(fields[field], order="F")
         if len(fields[field]) != len(x) * len(y) * len(z):
             raise ValueError(
                 "gstools.vtk_export_structured: "
@@ -120,7 +124,8 @@ def _vtk_unstructured_helper(pos, fields):
     if z is None:
         z = np.zeros_like(x)
     for field in fields:
-        fields[field] = fields[field].reshape(-1)
+        # view for C-contiguous fields, copy otherwise
+        fields[field] = np.ravel(fields[field])
         if (
             len(fields[field]) != len(x)
             or len(fields[field]) != len(y)
@@ -6,7 +6,17 @@ from __future__ import division, absolute_import, print_function
 
 import numpy as np
 import unittest
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import cdist
 from gstools import Gaussian, Exponential, Spherical, krige
+import gstools.krige.simple as krige_simple
+from gstools.krige.tools import (
+    get_dists,
+    compact_cov_mat,
+    packed_cov_chol,
+    krigesum_packed,
+    _stack_pos,
+)
 
 
 class TestKrige(unittest.TestCase):
@@ -96,6 +106,145 @@ class TestKrige(unittest.TestCase):
                     self.assertAlmostEqual(val, field_1[i], places=2)
                     self.assertAlmostEqual(val, field_2[dim * (i,)], places=2)
 
+    def test_chunked(self):
+        for dim in self.dims:
+            model = Gaussian(dim=dim, var=0.5, len_scale=2)
+            ordinary = krige.Ordinary(
+                model, self.cond_pos[:dim], self.cond_val
+            )
+            field, err = ordinary.unstructured(self.pos[:dim])
+            field_c, err_c = ordinary.unstructured(
+                self.pos[:dim], chunk_size=7
+            )
+            field_p, err_p = ordinary.unstructured(
+                self.pos[:dim], chunk_size=7, parallel=True
+            )
+            np.testing.assert_allclose(field, field_c)
+            np.testing.assert_allclose(err, err_c)
+            np.testing.assert_allclose(field, field_p)
+            np.testing.assert_allclose(err, err_p)
+
+    def test_structured_separable(self):
+        for Model in self.cov_models:
+            for dim in self.dims[1:]:
+                model = Model(dim=dim, var=0.5, len_scale=2, anis=[0.5, 2])
+                axes = [np.linspace(0, 5, 6 + i) for i in range(dim)]
+                mesh = np.meshgrid(*axes, indexing="ij")
+                pos_u = [axis.reshape(-1) for axis in mesh]
+                ordinary = krige.Ordinary(
+                    model, self.cond_pos[:dim], self.cond_val
+                )
+                field_s, err_s = ordinary.structured(axes)
+                field_u, err_u = ordinary.unstructured(pos_u)
+                np.testing.assert_allclose(field_s.reshape(-1), field_u)
+                np.testing.assert_allclose(err_s.reshape(-1), err_u)
+                simple = krige.Simple(
+                    model, self.mean, self.cond_pos[:dim], self.cond_val
+                )
+                field_s, err_s = simple.structured(axes)
+                field_u, err_u = simple.unstructured(pos_u)
+                np.testing.assert_allclose(field_s.reshape(-1), field_u)
+                np.testing.assert_allclose(err_s.reshape(-1), err_u)
+
+    def test_dtype(self):
+        for dim in self.dims:
+            model = Gaussian(dim=dim, var=0.5, len_scale=2)
+            ordinary = krige.Ordinary(
+                model, self.cond_pos[:dim], self.cond_val
+            )
+            ordinary_32 = krige.Ordinary(
+                model, self.cond_pos[:dim], self.cond_val, dtype=np.float32
+            )
+            field, err = ordinary.unstructured(self.pos[:dim])
+            field_32, err_32 = ordinary_32.unstructured(self.pos[:dim])
+            self.assertEqual(field_32.dtype, np.float32)
+            self.assertEqual(err_32.dtype, np.float32)
+            np.testing.assert_allclose(field, field_32, atol=1e-3)
+            np.testing.assert_allclose(err, err_32, atol=1e-3)
+            simple = krige.Simple(
+                model, self.mean, self.cond_pos[:dim], self.cond_val
+            )
+            simple_32 = krige.Simple(
+                model,
+                self.mean,
+                self.cond_pos[:dim],
+                self.cond_val,
+                dtype=np.float32,
+            )
+            field, err = simple.unstructured(self.pos[:dim])
+            field_32, err_32 = simple_32.unstructured(self.pos[:dim])
+            np.testing.assert_allclose(field, field_32, atol=1e-3)
+            np.testing.assert_allclose(err, err_32, atol=1e-3)
+        self.assertRaises(
+            ValueError,
+            krige.Ordinary,
+            model,
+            self.cond_pos[:dim],
+            self.cond_val,
+            dtype=int,
+        )
+
+    def test_packed(self):
+        model = Exponential(dim=3, var=0.5, len_scale=2, nugget=0.1)
+        state = np.random.RandomState(19900408)
+        for dtype in (np.double, np.float32):
+            pos = _stack_pos(state.rand(3, 40) * 10, 3, dtype=dtype)
+            fac = packed_cov_chol(model, pos)
+            self.assertIsNotNone(fac)
+            self.assertEqual(fac.dtype, dtype)
+            vecs = model.cov_nugget(cdist(pos, pos[:11])).astype(dtype)
+            cond = state.rand(40).astype(dtype)
+            field, err = krigesum_packed(fac, vecs, cond)
+            # dense reference solve in double precision
+            mat = model.cov_nugget(cdist(pos, pos))
+            solved = np.linalg.solve(mat, vecs.astype(np.double))
+            tol = 1e-3 if dtype == np.float32 else 1e-10
+            np.testing.assert_allclose(field, np.dot(cond, solved), atol=tol)
+            np.testing.assert_allclose(
+                err, np.einsum("ij,ij->j", vecs, solved), atol=tol
+            )
+        # force simple kriging over the packed path
+        model = Exponential(dim=2, var=0.5, len_scale=2)
+        simple = krige.Simple(
+            model, self.mean, self.cond_pos[:2], self.cond_val
+        )
+        field, err = simple.unstructured(self.pos[:2])
+        packed_min = krige_simple._PACKED_MIN
+        krige_simple._PACKED_MIN = 1
+        try:
+            field_p, err_p = simple.unstructured(self.pos[:2])
+        finally:
+            krige_simple._PACKED_MIN = packed_min
+        np.testing.assert_allclose(field, field_p)
+        np.testing.assert_allclose(err, err_p, atol=1e-10)
+
+    def test_get_dists_blocked(self):
+        # point sets above _BLOCK_MIN trigger the cache-blocked kernel,
+        # sizes are no multiples of _BLOCK to cover the partial blocks
+        state = np.random.RandomState(19900408)
+        pos1 = _stack_pos(state.rand(3, 300) * 10, 3)
+        pos2 = _stack_pos(state.rand(3, 270) * 10, 3)
+        dists = get_dists(None, None, 3, pos1_stack=pos1, pos2_stack=pos2)
+        np.testing.assert_allclose(dists, cdist(pos1, pos2))
+
+    def test_compact_cov_mat(self):
+        model = Spherical(dim=3, var=0.5, len_scale=2, nugget=0.1)
+        self.assertTrue(model.has_finite_range)
+        self.assertFalse(Gaussian(dim=3).has_finite_range)
+        state = np.random.RandomState(19900408)
+        pos1 = _stack_pos(state.rand(3, 20) * 10, 3)
+        pos2 = _stack_pos(state.rand(3, 30) * 10, 3)
+        dense = model.cov_nugget(
+            get_dists(None, None, 3, pos1_stack=pos1, pos2_stack=pos2)
+        )
+        sparse = compact_cov_mat(model, pos1, pos2)
+        np.testing.assert_allclose(dense, sparse)
+        # prebuilt trees as used by the chunked evaluation
+        sparse = compact_cov_mat(
+            model, pos1, pos2, tree1=cKDTree(pos1), tree2=cKDTree(pos2)
+        )
+        np.testing.assert_allclose(dense, sparse)
+
 
 if __name__ == "__main__":
     unittest.main()